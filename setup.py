@@ -0,0 +1,21 @@
+"""Build script for the cython extension.
+
+    python setup.py build_ext --inplace
+
+embedsignature is off so the generated C module does not carry signature
+docstrings around; the documentation lives in src_python/dhCodex.pyi.
+For the pure Python module, running under `python -OO` strips the one-line
+docstrings as well. Both combine well with a PGO/LTO-built interpreter.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+
+setup(
+    name="dhCodex",
+    version="1.0.0",
+    ext_modules=cythonize(
+        "src_cython/dhCodex.pyx",
+        compiler_directives={"embedsignature": False, "language_level": 3},
+    ),
+)
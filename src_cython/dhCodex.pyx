@@ -0,0 +1,275 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""dhCodex - cython - v1.0.0
+
+[LICENSE BELOW]
+
+The idea behind the codex is to hand over ownership of custom objects (Things)
+to one central authority (the Codex) and use UUIDs to retrieve references.
+The Codex maps UUIDs (128-bit ints) to Things (object).
+
+This is the cython port of the codex. Thing is a cdef class and the module
+functions are cpdef, so attribute access, isinstance dispatch and the dict
+bookkeeping all happen at C level instead of going through the interpreter
+loop. It keeps the int-keyed dict store of the original port - the pure
+Python module has since moved to a slot-array store - but the public API
+(UUID strings and integer keys, with the same 32-char hex string form)
+matches src_python/dhCodex.py.
+
+While Python (cython at least) is relatively good with circular dependencies,
+they should still be generally avoided and can cause problems with many other
+systems.
+Taking a parent-child relationship as an example, instead of the parent owning
+the child, both are owned by the Codex. To make the relationship, the parent
+would have a member `sa_children : list[str]` containing the UUIDs of
+all of its children. At the same time, the child can have a member
+`parent : str` containing the UUID of the parent.
+Both can have methods `get_children() -> list[Thing]` and `get_parent() -> Thing`
+respectively, retrieving a reference to the respective Things. This method
+allows circular relationships, composition and aggregation, many-to-many, one-to-many,
+many-to-one and one-to-one relationships.
+Thing provides a _on_remove() method which can/should be overwritten in subclasses
+to update other nodes with dependencies to the node being deleted.
+
+The Codex does not provide a direct implementation for hierarchies since the needs
+can vary, but it should provide a base to implement your system.
+
+=====================================================================================
+
+MIT License
+
+Copyright (c) 2023 Dominik Haase
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+=====================================================================================
+"""
+import uuid
+
+
+# Maps the UUID (int) to Thing. A plain cdef dict at module level replaces the
+# _get_mapping() function-attr trick from the Python version; access compiles
+# down to a single C dict operation.
+cdef dict _MAPPING = {}
+
+
+cdef class Thing:
+    """
+    The base class for all Things. Anything to be added to the Codex should inherit from Thing.
+    A Thing provides an UUID that's generated upon initilization of the object and which can
+    be queried through `get_uuid()`, as well as a `_on_remove()` method that's called when an
+    object gets removed from the Codex as well as in the destructor.
+    """
+    cdef readonly object _i_uuid
+
+    def __init__(self):
+        """
+        The constructor generates a new UUID for this thing and adds it to the Codex. All
+        subclasses must call this constructor.
+        """
+        self._i_uuid = uuid.uuid4().int
+        _MAPPING[self._i_uuid] = self
+
+    def __del__(self):
+        """
+        Finalizer safety net, same reasoning as the Python version: `_on_remove()`
+        should already have run through `remove()`, but someone might create a Thing
+        without calling its constructor in which case it never entered the Codex.
+        This deliberately is `__del__` (tp_finalize) and not `__dealloc__`: calling
+        an overridable Python method from `__dealloc__` is forbidden by the Cython
+        docs - by that point a subclass's `__dict__` is already torn down, so an
+        override touching its own state would fail. `__del__` runs while the object
+        is still intact, matching the pure-Python semantics.
+        """
+        self._on_remove()
+
+    cpdef _on_remove(self):
+        """
+        Called when a Thing is removed from the Codex. Overwrite in subclasses to
+        clean up dependencies (eg children). See the Python version for the full
+        reasoning.
+        """
+        pass
+
+    cpdef get_uuid(self):
+        """
+        Getter for the Thing's UUID. The string form is built on demand from the
+        stored integer - the 32-char unhyphenated hex form, same as the Python
+        version. The hyphenated form is still accepted on input.
+
+        Returns:
+            str: the Thing's UUID (32 hex chars, no hyphens)
+        """
+        return f"{self._i_uuid:032x}"
+
+
+cdef object _to_key(object thing_or_uuid):
+    """
+    Internal helper turning whatever the caller hands in into the integer key
+    used by the mapping. Malformed strings and foreign types coerce to -1,
+    which is never a mapping key, so they miss instead of raising - same
+    contract as the Python version.
+    """
+    if isinstance(thing_or_uuid, Thing):
+        return (<Thing>thing_or_uuid)._i_uuid
+    if isinstance(thing_or_uuid, int):
+        return thing_or_uuid
+    try:
+        return int(thing_or_uuid, 16)
+    except ValueError:
+        pass
+    except TypeError:
+        return -1
+    try:
+        # old hyphenated form
+        return uuid.UUID(hex=thing_or_uuid).int
+    except ValueError:
+        return -1
+
+
+cpdef Thing _add(Thing thing):
+    """
+    Adds a Thing to the Codex. Called automatically in the constructor of Thing,
+    no need to call this explicitly.
+
+    Args:
+        thing (Thing): The Thing instance to add
+
+    Returns:
+        Thing: Same object that was passed in
+    """
+    _MAPPING[thing._i_uuid] = thing
+    return thing
+
+
+cpdef Thing get(object i_or_s_uuid):
+    """
+    Returns a reference to a Thing from a given UUID. Passing the integer key
+    is the fast path, strings are accepted for convenience.
+
+    Args:
+        i_or_s_uuid (int|str): The UUID, either as integer key or string
+
+    Returns:
+        Thing|None: The Thing, or if the UUID cannot be found in the mapping, None
+    """
+    return <Thing>_MAPPING.get(_to_key(i_or_s_uuid), None)
+
+
+cpdef get_uuid(object thing_or_uuid):
+    """
+    Convenience method to get a UUID string from either a Thing or a UUID.
+
+    Args:
+        thing_or_uuid (str|int|Thing): The Thing or the UUID
+
+    Returns:
+        str: The UUID
+    """
+    if isinstance(thing_or_uuid, Thing):
+        return (<Thing>thing_or_uuid).get_uuid()
+    if isinstance(thing_or_uuid, int):
+        return f"{thing_or_uuid:032x}"
+    return thing_or_uuid
+
+
+cpdef Thing get_thing(object thing_or_uuid):
+    """
+    Convenience method to get a Thing from either a Thing or a UUID.
+
+    Args:
+        thing_or_uuid (str|int|Thing): The Thing or the UUID
+
+    Returns:
+        Thing|None: The Thing
+    """
+    if isinstance(thing_or_uuid, (str, int)):
+        return get(thing_or_uuid)
+    return <Thing>thing_or_uuid
+
+
+# Sentinel distinguishing "not in the mapping" from a stored None
+cdef object _MISSING = object()
+
+
+cpdef bint remove(object thing_or_uuid):
+    """
+    Deletes a Thing from the mapping. A single `dict.pop` with a sentinel does
+    membership test, retrieval and eviction in one hash/probe instead of three.
+
+    Args:
+        thing_or_uuid (str|int|Thing): Thing, integer key or UUID string of Thing to be removed
+
+    Returns:
+        bool: True if the object was removed, False if the object did not exist in the mapping
+    """
+    cdef object thing = _MAPPING.pop(_to_key(thing_or_uuid), _MISSING)
+    if thing is _MISSING:
+        return False
+
+    (<Thing>thing)._on_remove()
+    return True
+
+
+cpdef size():
+    """
+    Return the number of Things in the mapping.
+
+    Returns:
+        int: Number of Things in the mapping
+    """
+    return len(_MAPPING)
+
+
+# Horizontal rule of the `list_entries()` table, built once instead of per call
+cdef str _S_LINE = f"+{45 * '-'}"
+
+# Continuation indent for multi-line reprs in `list_entries()`. All UUID strings
+# are 32 hex chars, so the indent is identical for every row and can be built once
+cdef str _S_REPR_INDENT = f"\n|{(32 + 7) * ' '}"
+
+
+cpdef str list_entries(bint b_print=True):
+    """
+    Builds a nicely formatted string to visualize the UUID and the `repr(Thing)`
+    and optionally prints it as well. Assembled with one `str.join` over the
+    collected lines; repeated `+=` on a str turns quadratic on large codices.
+
+    Args:
+        b_print (bool): Whether to print this as well or not.
+
+    Returns:
+        str: The mapping in text form
+    """
+    cdef str s_prefix = f"| Codex:\n"
+    cdef str s_repr
+    cdef list a_lines = []
+    cdef Thing thing
+    for thing in _MAPPING.values():
+        s_repr = repr(thing)
+        # the `in` test is a single C-level scan; it spares single-line reprs
+        # (the usual case) the allocation done by str.replace
+        if "\n" in s_repr:
+            s_repr = s_repr.replace("\n", _S_REPR_INDENT)
+        a_lines.append(f"|    [{thing.get_uuid()}] {s_repr}")
+    cdef str s_content = "\n".join(a_lines) + ("\n" if a_lines else "")
+
+    s = _S_LINE + "\n" + s_prefix + s_content + _S_LINE
+    if b_print:
+        print(s)
+    return s
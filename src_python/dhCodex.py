@@ -54,195 +54,271 @@ SOFTWARE.
 
 =====================================================================================
 """
+import contextvars
+import functools
+import itertools
+import os
 import uuid
 
 
 class Thing:
-    """
-    The base class for all Things. Anything to be added to the Codex should inherit from Thing.
-    A Thing provides an UUID that's generated upon initilization of the object and which can
-    be queried through `get_uuid()`, as well as a `_on_remove()` method that's called when an
-    object gets removed from the Codex as well as in the destructor.
-    Removing a Thing from the Codex is similar to deleting it, but since ownership in Python
-    is not as strict as it is with unique_ptr in C++, an object may be removed from the index,
-    but not immediately deleted.
-    """
+    """The base class for all Things managed by the Codex. Full docs: dhCodex.pyi"""
+    __slots__ = ("_i_uuid",)
+
     def __init__(self):
-        """
-        The constructor generates a new UUID for this thing and adds it to the Codex. All
-        subclasses must call this constructor.
-        """
-        self._s_uuid = str(uuid.uuid4())
+        """Adds this thing to the Codex, which issues its UUID. Subclasses must call this."""
         _add(self)
 
-    def __del__(self):
-        """
-        As all Things should be managed through the Codex, it should not be necessary to call `_on_remove()`
-        in the destructor again. But, better safe than sorry. Someone might create a Thing without calling
-        its constructor in which case it would not get added to the Codex.
-        Check `_on_remove()` for more details.
-        """
-        self._on_remove()
+    @classmethod
+    def acquire(cls):
+        """Recycles a removed instance (new UUID, no __init__ call) or allocates a fresh one."""
+        a_pool = _CTX.get().a_pool
+        thing = a_pool.pop() if a_pool else None
+        if thing is None or type(thing) is not cls:
+            thing = cls.__new__(cls)
+        return _add(thing)
+
+    @classmethod
+    def acquire_many(cls, i_count):
+        """Batched version of `acquire()`: returns `i_count` Things of type `cls`."""
+        _acquire = cls.acquire
+        return [_acquire() for _ in range(i_count)]
+
+    def __init_subclass__(cls, **kwargs):
+        """Installs the safety-net `__del__` only on subclasses that overwrite `_on_remove()`."""
+        super().__init_subclass__(**kwargs)
+        if cls._on_remove is not Thing._on_remove and "__del__" not in cls.__dict__:
+            cls.__del__ = lambda self: self._on_remove()
 
     def _on_remove(self):
-        """
-        This method is similar to the destructor, but instead of being called at the end
-        of life of a Thing, it is instead called when a Thing is removed from the Codex.
-
-        For example:
-            thing = Thing()\n
-            remove(thing)
-
-        Python does not call `__del__()` since `thing` is still holding on to it. So removing
-        potential dependencies (eg children) in `__del__()` would be delayed until `thing`
-        goes out of scope. This is not what we want since the Codex should no longer contain
-        nodes we expect to be deleted.
-        `_on_remove()` solves this problem by being explicitly called when an object gets removed.
-        This allows for the removal of any dependents as well. While Python itself might hold on
-        to the Thing object, it will no longer be accessible through the Codex.
-        """
+        """Called when this Thing is removed from the Codex; overwrite to clean up dependents."""
         pass
 
-    def get_uuid(self):
-        """
-        Getter for the Thing's UUID
-
-        Returns:
-            str: the Thing's UUID
-        """
-        return self._s_uuid
+    def _key(self):
+        """Getter for the raw 128-bit integer key; skips the string formatting of `get_uuid()`."""
+        return self._i_uuid
 
+    def get_uuid(self):
+        """Getter for the Thing's UUID as string (32 hex chars, no hyphens), built on demand."""
+        return f"{self._i_uuid:032x}"
+
+
+# Low 64 bits of a UUID = the slot index into the store
+_SLOT_MASK = (1 << 64) - 1
+
+# The UUID tags come from a monotonic counter XOR'd with a per-process random
+# salt. Reading the CSPRNG for every single Thing is measurable when millions
+# get created, and an in-process key does not need cryptographic entropy: the
+# counter guarantees the tags (and with them the UUIDs) are collision-free
+# within the process, the salt keeps them from being guessable across runs.
+# Counter and salt are deliberately NOT part of the per-context state below,
+# so UUIDs stay unique across all codices in the process.
+_TAG_COUNTER = itertools.count(1)
+_TAG_SALT = int.from_bytes(os.urandom(8), "big")
+
+# Cap for the shells of removed Things recycled through `Thing.acquire()`, so
+# a one-off burst of removals cannot pin an unbounded number of dead objects
+_POOL_MAX = 1024
+
+
+class _CodexState:
+    """One Codex: the slot store, its free list and the shell pool."""
+    # a_things holds the Things themselves, indexed by the low 64 bits of their
+    # UUID (the slot). A removed Thing leaves a None hole; its slot index goes
+    # on ia_free and is handed to the next Thing added. The high 64 bits of
+    # each UUID are a tag unique to that Thing (see _TAG_COUNTER above), so a
+    # stale UUID whose slot has been reused fails the tag compare in get/remove
+    # instead of silently hitting the new occupant.
+    # Compared to a dict keyed by 128-bit ints, a lookup is one list index plus
+    # one int compare (no hashing, no probing), and bulk iteration (eg
+    # `list_entries()`) walks one contiguous array instead of chasing dict
+    # entries all over the heap.
+    __slots__ = ("a_things", "ia_free", "a_pool")
 
-def _get_mapping():
-    """
-    Returns the mapping dict between UUIDs and their Things.
-
-    This could be implemented in many different ways, but I chose to do what
-    I think is the closest to the static local variable implementation in cpp.
-    The key is called `.MAPPING` on purpose, so it cannot be accessed through
-    `_get_mapping._MAPPING` but only explicitly through _get_mapping.__dict__[...]
+    def __init__(self):
+        self.a_things = []
+        self.ia_free = []
+        self.a_pool = []
 
-    Returns:
-        dict: {str: Thing}
-    """
-    if ".MAPPING" not in _get_mapping.__dict__:
-        _get_mapping.__dict__[".MAPPING"] = {}
 
-    return _get_mapping.__dict__[".MAPPING"]
+# The current context's Codex. The shared default instance keeps the classic
+# behavior of one process-wide Codex; `fresh_codex()` gives a context (a thread
+# or an asyncio task and everything spawned from it) a Codex of its own, which
+# allows eg per-request codices in a server without any locking.
+_CTX = contextvars.ContextVar("dhcodex_state", default=_CodexState())
 
 
-def _add(thing):
-    """
-    This method is used to add a Thing to the Codex. This method is automatically called
-    in the constructor of Thing so there is no need to call this method explicitly in your
-    code.
-    No check is performed to see if the UUID already exists since UUIDs are, for all
-    practical purposes, considered to be unique. If a UUID is already part of the mapping,
-    its Thing will be overwritten with whats passed in
+def fresh_codex():
+    """Gives the current context its own empty Codex; returns a token for `_CTX.reset()`."""
+    return _CTX.set(_CodexState())
 
-    Args:
-        thing (Thing): The Thing instance to add
 
-    Returns:
-        Thing: Same object that was passed in
-    """
-    _get_mapping()[thing.get_uuid()] = thing
+@functools.lru_cache(maxsize=1024)
+def _parse_key(s_uuid):
+    """Parses a UUID string (plain hex or hyphenated) into the integer key; memoized."""
+    try:
+        return int(s_uuid, 16)
+    except ValueError:
+        pass
+    try:
+        # old hyphenated form
+        return uuid.UUID(hex=s_uuid).int
+    except ValueError:
+        # malformed strings miss like any unknown UUID instead of raising:
+        # -1 masks to a slot no store can ever reach
+        return -1
+
+
+def _coerce_key(thing_or_uuid, _Thing=Thing, _parse=_parse_key):
+    """Coerces a Thing, integer key or UUID string into the integer store key."""
+    # exact-type checks are a single pointer compare, isinstance walks the MRO;
+    # neither int nor str is commonly subclassed, so this catches nearly all calls
+    t_input = type(thing_or_uuid)
+    if t_input is int:
+        return thing_or_uuid
+    if t_input is str:
+        return _parse(thing_or_uuid)
+    if isinstance(thing_or_uuid, _Thing):
+        return thing_or_uuid._i_uuid
+    if isinstance(thing_or_uuid, int):
+        return thing_or_uuid
+    try:
+        return _parse(thing_or_uuid)
+    except TypeError:
+        # not a Thing, int or string at all - miss, like the dict lookup
+        # of old would have
+        return -1
+
+
+def _add(thing, _get_state=_CTX.get, _next_tag=_TAG_COUNTER.__next__,
+         _salt=_TAG_SALT, _mask=_SLOT_MASK):
+    """Adds a Thing to the current Codex and issues its UUID (slot | salted-counter tag)."""
+    _state = _get_state()
+    a_things = _state.a_things
+    ia_free = _state.ia_free
+    if ia_free:
+        i_slot = ia_free.pop()
+        a_things[i_slot] = thing
+    else:
+        i_slot = len(a_things)
+        a_things.append(thing)
+    thing._i_uuid = (((_next_tag() ^ _salt) & _mask) << 64) | i_slot
     return thing
 
 
-def get(s_uuid):
-    """
-    This method returns a reference to a Thing from a given UUID
+def get_by_uuid(i_uuid, _get_state=_CTX.get, _mask=_SLOT_MASK):
+    """Typed fast path of `get()`: integer key only, returns the Thing or None."""
+    a_things = _get_state().a_things
+    i_slot = i_uuid & _mask
+    if i_slot < len(a_things):
+        thing = a_things[i_slot]
+        if thing is not None and thing._i_uuid == i_uuid:
+            return thing
+    return None
 
-    Args:
-        s_uuid (str): The UUID
 
-    Returns:
-        Thing|None: The Thing, or if the UUID cannot be found in the mapping, None
-    """
-    return _get_mapping().get(s_uuid, None)
+def get(i_or_s_uuid):
+    """Returns the Thing for a given UUID (integer key or string), or None."""
+    return get_by_uuid(_coerce_key(i_or_s_uuid))
 
 
 def get_uuid(thing_or_uuid):
-    """
-    Convenience method to get a UUID from either a Thing or a UUID.
-
-    Args:
-        thing_or_uuid (str|Thing): The Thing or the UUID. If a Thing is provided,
-            its UUID is queried. If not, the input gets returned as is
-
-    Returns:
-        str: The UUID
-    """
+    """Convenience method to get a UUID string from either a Thing or a UUID."""
+    # exact-type fast path for the common string pass-through
+    if type(thing_or_uuid) is str:
+        return thing_or_uuid
     if isinstance(thing_or_uuid, Thing):
         return thing_or_uuid.get_uuid()
+    if isinstance(thing_or_uuid, int):
+        return f"{thing_or_uuid:032x}"
     return thing_or_uuid
 
 
 def get_thing(thing_or_uuid):
-    """
-    Convenience method to get a Thing from either a Thing or a UUID.
-
-    Args:
-        thing_or_uuid (str|Thing): The Thing or the UUID. If a UUID is provided,
-            its Thing is queried. If not, the input gets returned as is. If the
-
-    Returns:
-        Thing|None: The Thing
-    """
-    if isinstance(thing_or_uuid, str):
+    """Convenience method to get a Thing from either a Thing or a UUID."""
+    # exact-type fast path, isinstance only for str/int subclasses
+    t_input = type(thing_or_uuid)
+    if t_input is str or t_input is int:
+        return get(thing_or_uuid)
+    if isinstance(thing_or_uuid, (str, int)):
         return get(thing_or_uuid)
     return thing_or_uuid
 
 
-def remove(thing_or_uuid):
-    """
-    Method to delete a Thing from the mapping.
-
-    Args:
-        thing_or_uuid (str|Thing): Thing or UUID of Thing to be removed
-
-    Returns:
-        bool: True if the object was removed, False if the object did not exist in the mapping
-    """
-    _d_mapping = _get_mapping()
-    thing_or_uuid = thing_or_uuid.get_uuid() if isinstance(thing_or_uuid, Thing) else thing_or_uuid
-    if thing_or_uuid not in _d_mapping:
+def remove_by_uuid(i_uuid, _get_state=_CTX.get, _pool_max=_POOL_MAX, _mask=_SLOT_MASK):
+    """Typed fast path of `remove()`: integer key only; home of the actual removal logic."""
+    _state = _get_state()
+    a_things = _state.a_things
+    i_slot = i_uuid & _mask
+    if i_slot >= len(a_things):
+        return False
+    thing = a_things[i_slot]
+    if thing is None or thing._i_uuid != i_uuid:
         return False
 
-    _d_mapping[thing_or_uuid]._on_remove()
-    del _d_mapping[thing_or_uuid]
+    a_things[i_slot] = None
+    _state.ia_free.append(i_slot)
+    thing._on_remove()
+    a_pool = _state.a_pool
+    if len(a_pool) < _pool_max:
+        # -1 masks to a slot index no store can ever reach, so a stale
+        # reference to the pooled shell simply misses in get/remove
+        thing._i_uuid = -1
+        a_pool.append(thing)
     return True
 
 
+def remove_thing(thing):
+    """Typed fast path of `remove()` for callers that hold the Thing itself."""
+    return remove_by_uuid(thing._i_uuid)
+
+
+def remove(thing_or_uuid):
+    """Deletes a Thing (given as Thing, integer key or UUID string) from the Codex."""
+    return remove_by_uuid(_coerce_key(thing_or_uuid))
+
+
+def remove_many(thing_or_uuids):
+    """Batched `remove()`; returns the number of entries that actually got removed."""
+    _key = _coerce_key
+    _remove = remove_by_uuid
+    i_removed = 0
+    for thing_or_uuid in thing_or_uuids:
+        if _remove(_key(thing_or_uuid)):
+            i_removed += 1
+    return i_removed
+
+
 def size():
-    """
-    return the number of Things in the mapping
+    """Return the number of Things in the Codex."""
+    _state = _CTX.get()
+    return len(_state.a_things) - len(_state.ia_free)
 
-    Returns:
-        int: Number of Things in the mapping
-    """
-    return len(_get_mapping())
 
+# Horizontal rule of the `list_entries()` table, built once instead of per call
+_S_LINE = f"+{45 * '-'}"
 
-def list_entries(b_print=True):
-    """
-    This method builds a nicely formatted string to visualize the UUID and
-    the `repr(Thing)` and optionally prints it as well.
+# Continuation indent for multi-line reprs in `list_entries()`. All UUID strings
+# are 32 hex chars, so the indent is identical for every row and can be built once
+_S_REPR_INDENT = f"\n|{(32 + 7) * ' '}"
 
-    Args:
-        b_print (bool): Whether to print this as well or not.
 
-    Returns:
-        str: The mapping in text form
-    """
-    s_line = f"+{45 * '-'}"
+def list_entries(b_print=True):
+    """Builds (and optionally prints) a formatted table of the Codex's entries."""
     s_prefix = f"| Codex:\n"
-    s_content = ""
-    for s_uuid, thing in _get_mapping().items():
-        s_content += f"|    [{s_uuid}] " + repr(thing).replace("\n", f"\n|{(len(s_uuid)+7)*' '}") + "\n"
-
-    s = s_line + "\n" + s_prefix + s_content + s_line
+    a_lines = []
+    for thing in _CTX.get().a_things:
+        if thing is None:
+            continue
+        s_repr = repr(thing)
+        # the `in` test is a single C-level scan; it spares single-line reprs
+        # (the usual case) the allocation done by str.replace
+        if "\n" in s_repr:
+            s_repr = s_repr.replace("\n", _S_REPR_INDENT)
+        a_lines.append(f"|    [{thing.get_uuid()}] {s_repr}")
+    s_content = "\n".join(a_lines) + ("\n" if a_lines else "")
+
+    s = _S_LINE + "\n" + s_prefix + s_content + _S_LINE
     if b_print:
         print(s)
     return s
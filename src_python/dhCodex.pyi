@@ -0,0 +1,289 @@
+"""Typing stub and API documentation for dhCodex.
+
+The runtime module keeps its docstrings to one line each so the compiled
+.pyc stays small and imports fast (and `python -OO` strips even those).
+The full documentation lives here, where editors and type checkers pick
+it up without the interpreter ever loading it.
+"""
+import contextvars
+from typing import Iterable
+
+
+class Thing:
+    """
+    The base class for all Things. Anything to be added to the Codex should inherit from Thing.
+    A Thing provides an UUID that's generated upon initilization of the object and which can
+    be queried through `get_uuid()`, as well as a `_on_remove()` method that's called when an
+    object gets removed from the Codex as well as in the destructor.
+    Removing a Thing from the Codex is similar to deleting it, but since ownership in Python
+    is not as strict as it is with unique_ptr in C++, an object may be removed from the index,
+    but not immediately deleted.
+    Thing declares `__slots__`, so instances carry no `__dict__`: the UUID lives at a fixed
+    C-level offset, which makes every `self._i_uuid` access cheaper and shrinks each instance
+    by the size of an attribute dict. Subclasses should declare `__slots__` for their own
+    members as well, otherwise the per-instance `__dict__` (and its cost) comes right back.
+    """
+    _i_uuid: int
+
+    def __init__(self) -> None:
+        """
+        The constructor adds this thing to the Codex, which issues its UUID. All
+        subclasses must call this constructor.
+        The UUID is stored as its raw 128-bit integer: the low 64 bits are the Thing's
+        slot in the Codex store, the high 64 bits a unique tag. A lookup is therefore
+        a single list index plus one int compare. The familiar string form is only
+        produced at the boundary, in `get_uuid()`.
+        """
+        ...
+
+    @classmethod
+    def acquire(cls) -> "Thing":
+        """
+        Alternative 'constructor' that recycles a removed instance from the pool
+        instead of allocating a fresh one. On workloads that churn through
+        create/remove cycles this skips the allocator entirely for most objects.
+
+        The recycled instance gets a brand new UUID and is added to the Codex
+        like any other Thing, but `__init__` is NOT called on it. Subclasses
+        with state of their own are responsible for resetting it after calling
+        `acquire()` (or for overwriting `acquire()` and doing it there). If the
+        pool is empty, or its most recent entry is of a different class, a fresh
+        instance is allocated instead.
+        The normal `Thing()` path is unaffected; pooling is strictly opt-in.
+
+        Returns:
+            Thing: A Thing of type `cls`, registered in the Codex
+        """
+        ...
+
+    @classmethod
+    def acquire_many(cls, i_count: int) -> list["Thing"]:
+        """
+        Batched version of `acquire()`. Creating Things one by one from a hot
+        loop pays the full call overhead per object; doing it in one call
+        amortizes that over the batch. Like `acquire()`, recycled instances do
+        not get `__init__` called on them.
+
+        Args:
+            i_count (int): How many Things to create
+
+        Returns:
+            list[Thing]: `i_count` Things of type `cls`, registered in the Codex
+        """
+        ...
+
+    def _on_remove(self) -> None:
+        """
+        This method is similar to the destructor, but instead of being called at the end
+        of life of a Thing, it is instead called when a Thing is removed from the Codex.
+
+        For example:
+            thing = Thing()
+            remove(thing)
+
+        Python does not call `__del__()` since `thing` is still holding on to it. So removing
+        potential dependencies (eg children) in `__del__()` would be delayed until `thing`
+        goes out of scope. This is not what we want since the Codex should no longer contain
+        nodes we expect to be deleted.
+        `_on_remove()` solves this problem by being explicitly called when an object gets removed.
+        This allows for the removal of any dependents as well. While Python itself might hold on
+        to the Thing object, it will no longer be accessible through the Codex.
+
+        Subclasses that overwrite this get a safety-net `__del__` installed via
+        `__init_subclass__`; the base Thing carries no finalizer at all so the
+        garbage collector can treat plain instances as ordinary objects.
+        """
+        ...
+
+    def _key(self) -> int:
+        """
+        Getter for the raw integer key used in the store. Prefer this over
+        `get_uuid()` in hot loops to avoid the string formatting.
+
+        Returns:
+            int: the Thing's UUID as a 128-bit integer
+        """
+        ...
+
+    def get_uuid(self) -> str:
+        """
+        Getter for the Thing's UUID. The string form is built on demand from the
+        stored integer, so only code that actually needs the string pays for it.
+        The string is the 32-char unhyphenated hex form; the hyphenated form is
+        still accepted everywhere a UUID string can be passed in.
+
+        Returns:
+            str: the Thing's UUID (32 hex chars, no hyphens)
+        """
+        ...
+
+
+def get_by_uuid(i_uuid: int) -> Thing | None:
+    """
+    Typed fast path of `get()`: takes the integer key directly, no type
+    dispatch, no string parsing. Use this in hot loops where the key is
+    already an int.
+    The low 64 bits of the UUID index straight into the store; the tag
+    compare rejects stale UUIDs whose slot has been reused.
+
+    Args:
+        i_uuid (int): The UUID as integer key
+
+    Returns:
+        Thing|None: The Thing, or if the UUID cannot be found in the mapping, None
+    """
+    ...
+
+
+def get(i_or_s_uuid: int | str) -> Thing | None:
+    """
+    This method returns a reference to a Thing from a given UUID.
+    Passing the integer key is the fast path, strings are accepted
+    for convenience and parsed once before the lookup.
+    Malformed strings (or inputs of another type entirely) never raise,
+    they simply miss and yield None.
+
+    Args:
+        i_or_s_uuid (int|str): The UUID, either as integer key or string
+
+    Returns:
+        Thing|None: The Thing, or if the UUID cannot be found in the mapping, None
+    """
+    ...
+
+
+def get_uuid(thing_or_uuid: str | int | Thing) -> str:
+    """
+    Convenience method to get a UUID string from either a Thing or a UUID.
+
+    Args:
+        thing_or_uuid (str|int|Thing): The Thing or the UUID. If a Thing is provided,
+            its UUID is queried. An integer key gets formatted into the string form.
+            Strings get returned as is
+
+    Returns:
+        str: The UUID (32 hex chars, no hyphens)
+    """
+    ...
+
+
+def get_thing(thing_or_uuid: str | int | Thing) -> Thing | None:
+    """
+    Convenience method to get a Thing from either a Thing or a UUID.
+
+    Args:
+        thing_or_uuid (str|int|Thing): The Thing or the UUID. If a UUID is provided,
+            its Thing is queried. If not, the input gets returned as is
+
+    Returns:
+        Thing|None: The Thing
+    """
+    ...
+
+
+def remove_by_uuid(i_uuid: int) -> bool:
+    """
+    Typed fast path of `remove()`: takes the integer key directly, no type
+    dispatch, no string parsing. This is where the actual removal happens,
+    the polymorphic `remove()` and `remove_thing()` funnel into it.
+    The slot is blanked and recycled through the free list; `_on_remove()`
+    runs after the Thing is already unreachable through the Codex.
+
+    Args:
+        i_uuid (int): The UUID as integer key
+
+    Returns:
+        bool: True if the object was removed, False if the object did not exist in the mapping
+    """
+    ...
+
+
+def remove_thing(thing: Thing) -> bool:
+    """
+    Typed fast path of `remove()` for callers that hold the Thing itself.
+
+    Args:
+        thing (Thing): The Thing to be removed
+
+    Returns:
+        bool: True if the object was removed, False if the object did not exist in the mapping
+    """
+    ...
+
+
+def remove(thing_or_uuid: str | int | Thing) -> bool:
+    """
+    Method to delete a Thing from the mapping. Polymorphic convenience wrapper
+    around `remove_thing()`/`remove_by_uuid()`, which hot loops can call
+    directly to skip the type dispatch here.
+    Malformed strings (or inputs of another type entirely) never raise,
+    they simply miss and yield False.
+
+    Args:
+        thing_or_uuid (str|int|Thing): Thing, integer key or UUID string of Thing to be removed
+
+    Returns:
+        bool: True if the object was removed, False if the object did not exist in the mapping
+    """
+    ...
+
+
+def remove_many(thing_or_uuids: Iterable[str | int | Thing]) -> int:
+    """
+    Batched version of `remove()` for bulk deletions (eg tearing down a whole
+    subtree). One call amortizes the per-call overhead over the batch.
+    Note that `_on_remove()` callbacks fire one by one as the batch is worked
+    through, so they observe a partially updated Codex - same as issuing the
+    `remove()` calls individually. Malformed entries never abort the batch,
+    they are skipped like any entry that is not in the Codex.
+
+    Args:
+        thing_or_uuids (iterable[str|int|Thing]): Things, integer keys or UUID
+            strings of the Things to be removed
+
+    Returns:
+        int: Number of objects that were removed (entries that did not exist
+            in the mapping are skipped, like `remove()` returning False)
+    """
+    ...
+
+
+def fresh_codex() -> contextvars.Token:
+    """
+    Gives the current context its own empty Codex.
+
+    By default the whole process shares one Codex, like it always has. After
+    calling this, the calling context - a thread, an asyncio task, and
+    everything spawned from it - works on a private Codex instead, which
+    enables eg per-request codices in a server without any locking. UUIDs
+    remain unique across all codices in the process.
+
+    Returns:
+        contextvars.Token: Token to restore the previous Codex via the
+            underlying ContextVar's `reset()`
+    """
+    ...
+
+
+def size() -> int:
+    """
+    return the number of Things in the mapping
+
+    Returns:
+        int: Number of Things in the mapping
+    """
+    ...
+
+
+def list_entries(b_print: bool = True) -> str:
+    """
+    This method builds a nicely formatted string to visualize the UUID and
+    the `repr(Thing)` and optionally prints it as well.
+
+    Args:
+        b_print (bool): Whether to print this as well or not.
+
+    Returns:
+        str: The mapping in text form
+    """
+    ...